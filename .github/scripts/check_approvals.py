@@ -1,21 +1,55 @@
 import os
 import sys
-import json
-import requests
+import pickle
+import asyncio
+import orjson
+import httpx
 import logging
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 import shlex
+import re
+import fnmatch
 
 logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
 
 TOKEN = os.environ.get('GITHUB_TOKEN', '')
 GITHUB_EVENT_PATH = os.environ.get('GITHUB_EVENT_PATH', '')
 GITHUB_REPOSITORY = os.environ.get('GITHUB_REPOSITORY', '')
+# Where results that only depend on the PR revision are kept between runs
+CACHE_DIR = os.environ.get('CHECK_APPROVALS_CACHE_DIR') or os.environ.get('RUNNER_TEMP', '')
 HEADERS = {
     'Authorization': f'token {TOKEN}',
     'Accept': 'application/vnd.github.v3+json'
 }
 CODEOWNERS_FILE = '.github/CODEOWNERS-DWH'
+# Bump when the structure returned by parse_codeowners changes
+RULES_CACHE_VERSION = 1
+# Characters that make a CODEOWNERS pattern a glob rather than a literal path
+GLOB_CHARS = re.compile(r'[*?\[]')
+GRAPHQL_URL = 'https://api.github.com/graphql'
+# httpx defaults to 5s, large PRs can take longer to resolve
+REQUEST_TIMEOUT = 30
+
+# Changed files and approvals in one round trip. A connection is dropped from
+# the query via @include once all of its pages have been read.
+PR_DATA_QUERY = '''
+query($owner: String!, $repo: String!, $number: Int!,
+      $withFiles: Boolean!, $filesCursor: String,
+      $withReviews: Boolean!, $reviewsCursor: String) {
+  repository(owner: $owner, name: $repo) {
+    pullRequest(number: $number) {
+      files(first: 100, after: $filesCursor) @include(if: $withFiles) {
+        nodes { path }
+        pageInfo { hasNextPage endCursor }
+      }
+      reviews(first: 100, after: $reviewsCursor, states: [APPROVED]) @include(if: $withReviews) {
+        nodes { author { login } }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  }
+}
+'''
 
 
 def fail(message):
@@ -23,44 +57,31 @@ def fail(message):
     sys.exit(1)
 
 
-def make_request(url):
+async def make_graphql_request(client, query, variables):
     try:
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status() 
-        data = response.json()
-        headers = response.headers
-        return data, headers
-    except requests.exceptions.HTTPError as e:
-        raise Exception(f"HTTPError when requesting {url}: {e.response.status_code} {e.response.reason}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed during request to {url}: {e}")
-
-
-def get_next_page(headers):
-    link_header = headers.get('Link')
-    if not link_header:
-        return None
-    links = link_header.split(',')
-    for link in links:
-        parts = link.split(';')
-        if len(parts) == 2:
-            try:
-                url_part = parts[0].strip()[1:-1]
-                rel_part = parts[1].strip()
-                if rel_part == 'rel="next"':
-                    return url_part
-            except Exception:
-                continue
-    return None
+        response = await client.post(GRAPHQL_URL, json={'query': query, 'variables': variables})
+        response.raise_for_status()
+        payload = orjson.loads(response.content)
+    except httpx.HTTPStatusError as e:
+        raise Exception(f"HTTPError when requesting {GRAPHQL_URL}: {e.response.status_code} {e.response.reason_phrase}")
+    except httpx.HTTPError as e:
+        raise Exception(f"Failed during request to {GRAPHQL_URL}: {e}")
+
+    if payload.get('errors'):
+        messages = '; '.join(error.get('message', str(error)) for error in payload['errors'])
+        raise Exception(f"GraphQL query failed: {messages}")
+    return payload['data']
 
 
 def get_pr_context(repo_full_str, event_path_str):
     try:
         owner, repo = repo_full_str.split('/')
-        with open(event_path_str, 'r') as f:
-            event_data = json.load(f)
-        pr_number = event_data['pull_request']['number']
-        return owner, repo, pr_number
+        with open(event_path_str, 'rb') as f:
+            event_data = orjson.loads(f.read())
+        pull_request = event_data['pull_request']
+        pr_number = pull_request['number']
+        revision = (pull_request['head']['sha'], pull_request['base']['sha'])
+        return owner, repo, pr_number, revision
     except FileNotFoundError:
         fail(f"Failed to read event path: {event_path_str}")
     except (AttributeError, TypeError, KeyError):
@@ -69,14 +90,66 @@ def get_pr_context(repo_full_str, event_path_str):
         fail(f"Failed to get PR context: {e}")
 
 
-def _process_logical_line(logical_line, line_start_number, rules_list):
+def _translate_component(part):
+    # fnmatch semantics for a single path component: wildcards never match '/'
+    res = []
+    i, n = 0, len(part)
+    while i < n:
+        c = part[i]
+        i += 1
+        if c == '*':
+            if not res or res[-1] != '[^/]*':
+                res.append('[^/]*')
+        elif c == '?':
+            res.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < n and part[j] == '!':
+                j += 1
+            if j < n and part[j] == ']':
+                j += 1
+            while j < n and part[j] != ']':
+                j += 1
+            if j >= n:
+                res.append('\\[')
+                continue
+            # Let fnmatch deal with ranges and escaping inside the brackets,
+            # then strip its '(?s:...)\Z' wrapper
+            char_class = fnmatch.translate(part[i - 1:j + 1])[4:-3]
+            if char_class == '.':
+                char_class = '[^/]'
+            elif char_class.startswith('[^'):
+                char_class = char_class[:-1] + '/]'
+            res.append(char_class)
+            i = j + 1
+        else:
+            res.append(re.escape(c))
+    return ''.join(res)
+
+
+def _translate_pattern(pattern):
+    # Regex equivalent of PurePath(file).match(pattern): a relative pattern is
+    # matched against the trailing components of the path.
+    pattern_path = PurePosixPath(pattern)
+    if not pattern_path.parts:
+        raise ValueError(f"empty pattern: {pattern!r}")
+    if pattern_path.is_absolute():
+        return '(?!)'  # Changed files are relative, nothing can match
+    return '(?:.*/)?' + '/'.join(_translate_component(part) for part in pattern_path.parts) + r'\Z'
+
+
+def _process_logical_line(logical_line, line_start_number, rules_list, owner_sets_pool):
     line = logical_line.strip()
     if not line:
         return
 
     try:
-        # Safely parse paths with spaces
-        parts = shlex.split(line)
+        # Safely parse paths with spaces. shlex is only needed when the line
+        # quotes or escapes something, a plain split gives the same result otherwise.
+        if '"' in line or "'" in line or '\\' in line:
+            parts = shlex.split(line)
+        else:
+            parts = line.split()
     except ValueError as e:
         logging.warning(f"Skipping malformed logical line (starting around L{line_start_number}): {line} | Error: {e}")
         return
@@ -106,17 +179,24 @@ def _process_logical_line(logical_line, line_start_number, rules_list):
             final_patterns.append(p)
 
     # An owner MUST start with '@'.
-    owners = {o.replace('@', '') for o in owner_strings if o.startswith('@')}
+    owners = frozenset(sys.intern(o.replace('@', '')) for o in owner_strings if o.startswith('@'))
     
     if not owners:
         logging.warning(f"No owners found for pattern on logical line (starting around L{line_start_number}): {raw_pattern}")
         return
         
-    rules_list.append({'patterns': final_patterns, 'owners': owners})
+    # Translate once here instead of re-parsing the glob for every changed file
+    regexes = [_translate_pattern(p) for p in final_patterns]
+
+    # Rules with the same owners share one interned frozenset
+    owners = owner_sets_pool.setdefault(owners, owners)
+
+    rules_list.append({'patterns': final_patterns, 'regexes': regexes, 'owners': owners})
 
 
 def parse_codeowners(filepath):
     rules = []
+    owner_sets_pool = {}
     logical_line_buffer = ""  # Buffer for "stitched" multi-line rules
     logical_line_start_number = 1
     
@@ -130,7 +210,7 @@ def parse_codeowners(filepath):
                 if not line_stripped:
                     # Empty line = end of a rule. Process the buffer.
                     if logical_line_buffer:
-                        _process_logical_line(logical_line_buffer, logical_line_start_number, rules)
+                        _process_logical_line(logical_line_buffer, logical_line_start_number, rules, owner_sets_pool)
                         logical_line_buffer = ""
                     logical_line_start_number = line_number + 1
                     continue
@@ -141,7 +221,7 @@ def parse_codeowners(filepath):
                 if is_new_rule:
                     # Found a new rule. Process the old buffer first.
                     if logical_line_buffer:
-                        _process_logical_line(logical_line_buffer, logical_line_start_number, rules)
+                        _process_logical_line(logical_line_buffer, logical_line_start_number, rules, owner_sets_pool)
                     
                     # Start new buffer (removing any trailing '\')
                     logical_line_buffer = line_stripped.rstrip('\\').strip()
@@ -157,13 +237,13 @@ def parse_codeowners(filepath):
                 else:
                     # This is the end of the rule (no '\'). Process the buffer.
                     if logical_line_buffer:
-                        _process_logical_line(logical_line_buffer, logical_line_start_number, rules)
+                        _process_logical_line(logical_line_buffer, logical_line_start_number, rules, owner_sets_pool)
                     logical_line_buffer = ""
                     logical_line_start_number = line_number + 1
             
             # Process any remaining buffer at the end of the file
             if logical_line_buffer.strip():
-                _process_logical_line(logical_line_buffer, logical_line_start_number, rules)
+                _process_logical_line(logical_line_buffer, logical_line_start_number, rules, owner_sets_pool)
 
     except FileNotFoundError:
         fail(f"Failed to read {filepath}: File not found.")
@@ -173,74 +253,307 @@ def parse_codeowners(filepath):
     return rules
 
 
-def get_changed_files(owner, repo, pr_number):
-    all_files = []
-    next_url = f'https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/files?per_page=100'
-    
-    while next_url:
-        logging.info(f"Fetching changed files from: {next_url}")
-        data, headers = make_request(next_url)
-        
-        all_files.extend([Path(f['filename']) for f in data])
-        
-        next_url = get_next_page(headers)
-        
-    logging.info(f"Total files found: {len(all_files)}")
-    return all_files
+def load_codeowners(filepath):
+    # Parsed rules only change with the file, reuse them while mtime and size match
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return parse_codeowners(filepath)  # Reports the error
+    cache_key = (RULES_CACHE_VERSION, os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+    cache_path = Path(CACHE_DIR) / 'codeowners.cache' if CACHE_DIR else None
+
+    if cache_path is not None:
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, cached_rules = pickle.load(f)
+            if cached_key == cache_key:
+                logging.info(f"Using cached CODEOWNERS rules from: {cache_path}")
+                return cached_rules
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable CODEOWNERS cache {cache_path}: {e}")
+
+    rules = parse_codeowners(filepath)
+
+    if cache_path is not None:
+        try:
+            with open(cache_path, 'wb') as f:
+                pickle.dump((cache_key, rules), f)
+        except OSError as e:
+            logging.warning(f"Failed to write CODEOWNERS cache {cache_path}: {e}")
+    return rules
 
 
-def get_approved_users(owner, repo, pr_number):
-    all_approved_users = set()
-    next_url = f'https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/reviews?per_page=100'
-    
-    while next_url:
-        logging.info(f"Fetching reviews from: {next_url}")
-        data, headers = make_request(next_url)
-        
-        approved_in_page = {
-            review['user']['login']
-            for review in data
-            if review['state'] == 'APPROVED'
-        }
-        all_approved_users.update(approved_in_page)
-        
-        next_url = get_next_page(headers)
-    
-    logging.info(f"Found approvals from: {', '.join(all_approved_users) if all_approved_users else 'None'}")
-    return all_approved_users
+def build_matcher(rules):
+    # Identical patterns from different rules are matched only once. Through a
+    # shared pattern only the last rule using it can win ("Last Match Wins").
+    pattern_to_rules = {}
+    regex_of_pattern = {}
+    for rule_index, rule in enumerate(rules):
+        for pattern, regex in zip(rule['patterns'], rule['regexes']):
+            pattern_to_rules.setdefault(pattern, []).append(rule_index)
+            regex_of_pattern[pattern] = regex
+
+    # Patterns without wildcards are plain trailing paths and are looked up
+    # directly instead of going through the regex
+    literal_rules = {}
+    glob_patterns = []
+    for pattern, rule_indexes in pattern_to_rules.items():
+        if GLOB_CHARS.search(pattern):
+            glob_patterns.append(pattern)
+            continue
+        pattern_path = PurePosixPath(pattern)
+        if pattern_path.is_absolute():
+            continue  # Changed files are relative, nothing can match
+        literal = str(pattern_path)
+        literal_rules[literal] = max(literal_rules.get(literal, -1), rule_indexes[-1])
+
+    # '**/X' only matches files that X matches as well, so it can never win
+    # over a literal X from the same or a later rule
+    glob_patterns = [
+        pattern for pattern in glob_patterns
+        if not (pattern.startswith('**/')
+                and literal_rules.get(str(PurePosixPath(pattern[3:])), -1) >= pattern_to_rules[pattern][-1])
+    ]
+
+    # The remaining globs are fused into one alternation, ordered by the rule
+    # they resolve to (descending). The regex engine returns the first
+    # alternative that matches, so a single scan finds the winning glob rule.
+    glob_patterns.sort(key=lambda pattern: pattern_to_rules[pattern][-1], reverse=True)
+    alternatives = []
+    rule_of_group = {}
+    for pattern in glob_patterns:
+        group = f"r{len(alternatives)}"
+        alternatives.append(f"(?P<{group}>{regex_of_pattern[pattern]})")
+        rule_of_group[group] = pattern_to_rules[pattern][-1]
+
+    return {
+        'literal_rules': literal_rules,
+        'glob_re': re.compile('|'.join(alternatives) if alternatives else '(?!)'),
+        'rule_of_group': rule_of_group,
+        'max_glob_rule': pattern_to_rules[glob_patterns[0]][-1] if glob_patterns else -1,
+    }
+
+
+def match_rule(matcher, file_path):
+    # A literal pattern matches when it equals the path or one of its trailing
+    # component suffixes ('a/b/c', 'b/c', 'c')
+    rule_index = -1
+    literal_rules = matcher['literal_rules']
+    if literal_rules:
+        suffix = file_path
+        while True:
+            rule_index = max(rule_index, literal_rules.get(suffix, -1))
+            slash = suffix.find('/')
+            if slash < 0:
+                break
+            suffix = suffix[slash + 1:]
+
+    # Only run the regex if some glob belongs to a later rule than the literal match
+    if matcher['max_glob_rule'] > rule_index:
+        match = matcher['glob_re'].fullmatch(file_path)
+        if match:
+            rule_index = max(rule_index, matcher['rule_of_group'][match.lastgroup])
+
+    return rule_index if rule_index >= 0 else None
+
+
+def _parent_dir(file_path):
+    return file_path.rpartition('/')[0]
+
+
+def _parent_dir_and_extension(file_path):
+    parent, _, name = file_path.rpartition('/')
+    return parent, name.rpartition('.')[2] if '.' in name else None
+
+
+def build_owner_index(rules):
+    owner_index = {}
+    for rule_index, rule in enumerate(rules):
+        for owner in rule['owners']:
+            owner_index.setdefault(owner, set()).add(rule_index)
+    return owner_index
+
+
+def get_resolution_key(rules):
+    # Files resolve to the same rule when they share a directory, as long as no
+    # pattern looks at the file name itself ('*' as the last component). If the
+    # only file name patterns are '*.ext', directory + extension is enough.
+    # Any other file name pattern means every file must be matched on its own.
+    uses_extension = False
+    for rule in rules:
+        for pattern in rule['patterns']:
+            name = PurePosixPath(pattern).name
+            if not name.strip('*'):
+                continue
+            if name.startswith('*.') and not re.search(r'[*?\[.]', name[2:]):
+                uses_extension = True
+                continue
+            return None
+    return _parent_dir_and_extension if uses_extension else _parent_dir
+
+
+def _files_cache_path(pr_number, revision):
+    if not CACHE_DIR:
+        return None
+    head_sha, base_sha = revision
+    return Path(CACHE_DIR) / f"pr-{pr_number}-{head_sha}-{base_sha}-files.json"
+
+
+def load_cached_files(pr_number, revision):
+    # The changed files are fixed for a head/base pair; reviews are never cached
+    cache_path = _files_cache_path(pr_number, revision)
+    if cache_path is None:
+        return None
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_files = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable files cache {cache_path}: {e}")
+        return None
+    logging.info(f"Using cached changed files from: {cache_path}")
+    return cached_files
+
+
+def store_cached_files(pr_number, revision, changed_files):
+    cache_path = _files_cache_path(pr_number, revision)
+    if cache_path is None:
+        return
+    try:
+        with open(cache_path, 'wb') as f:
+            f.write(orjson.dumps(changed_files))
+    except OSError as e:
+        logging.warning(f"Failed to write files cache {cache_path}: {e}")
+
+
+async def _fetch_pr_page(client, variables, changed_files, approved_users, all_owners):
+    # One query for the next page of each connection still enabled in variables
+    connections = []
+    if variables['withFiles']:
+        connections.append(f"files cursor: {variables['filesCursor']}")
+    if variables['withReviews']:
+        connections.append(f"reviews cursor: {variables['reviewsCursor']}")
+    logging.info(f"Fetching PR data via GraphQL ({', '.join(connections)})")
+    data = await make_graphql_request(client, PR_DATA_QUERY, variables)
+
+    pull_request = (data.get('repository') or {}).get('pullRequest')
+    if not pull_request:
+        raise Exception(f"Pull request #{variables['number']} not found in {variables['owner']}/{variables['repo']}")
+
+    if variables['withFiles']:
+        files = pull_request['files']
+        changed_files.extend([node['path'] for node in files['nodes']])
+        variables['withFiles'] = files['pageInfo']['hasNextPage']
+        variables['filesCursor'] = files['pageInfo']['endCursor']
+
+    if variables['withReviews']:
+        reviews = pull_request['reviews']
+        # 'author' is null for reviews left by deleted accounts
+        approved_users.update(sys.intern(node['author']['login']) for node in reviews['nodes'] if node['author'])
+        variables['withReviews'] = reviews['pageInfo']['hasNextPage']
+        variables['reviewsCursor'] = reviews['pageInfo']['endCursor']
+        # More approvals cannot change the outcome once every owner has approved
+        if variables['withReviews'] and all_owners is not None and approved_users >= all_owners:
+            logging.info("Every CODEOWNERS owner has approved, skipping remaining reviews.")
+            variables['withReviews'] = False
+
+
+async def _follow_pr_pages(client, variables, changed_files, approved_users, all_owners):
+    while variables['withFiles'] or variables['withReviews']:
+        await _fetch_pr_page(client, variables, changed_files, approved_users, all_owners)
+
+
+async def fetch_pr_data_graphql(client, owner, repo, pr_number, cached_files=None, all_owners=None):
+    changed_files = list(cached_files) if cached_files is not None else []
+    approved_users = set()
+    variables = {
+        'owner': owner,
+        'repo': repo,
+        'number': pr_number,
+        'withFiles': cached_files is None,
+        'filesCursor': None,
+        'withReviews': True,
+        'reviewsCursor': None,
+    }
+
+    # The first page of both connections comes in a single query
+    await _fetch_pr_page(client, variables, changed_files, approved_users, all_owners)
+
+    # Remaining files and reviews pages are independent, follow both cursors concurrently
+    await asyncio.gather(
+        _follow_pr_pages(client, {**variables, 'withReviews': False}, changed_files, approved_users, all_owners),
+        _follow_pr_pages(client, {**variables, 'withFiles': False}, changed_files, approved_users, all_owners),
+    )
+
+    logging.info(f"Total files found: {len(changed_files)}")
+    logging.info(f"Found approvals from: {', '.join(approved_users) if approved_users else 'None'}")
+    return changed_files, approved_users
 
 
 def check_file_coverage(changed_files, rules, approved_users):
     uncovered_files_list = []
-    
-    # Reverse rules to turn "Last Match Wins" into "First Match Wins"
-    reversed_rules = list(reversed(rules))
+
+    # A trailing catch-all rule is the last match for every file, so its owners
+    # alone decide coverage
+    if rules and rules[-1]['patterns'] in (['*'], ['**']):
+        intersection = approved_users.intersection(rules[-1]['owners'])
+        if intersection:
+            logging.info(f"All files are covered by the catch-all rule, approved by: {', '.join(intersection)}")
+            return uncovered_files_list
+
+    matcher = build_matcher(rules)
+    resolution_key = get_resolution_key(rules)
+    resolved_rules = {}
+
+    # Rules covered by at least one approver, so a file's coverage is a single
+    # lookup of its winning rule
+    owner_index = build_owner_index(rules)
+    approvers_by_rule = {}
+    for user in approved_users:
+        for rule_index in owner_index.get(user, ()):
+            approvers_by_rule.setdefault(rule_index, []).append(user)
+    approvers_by_rule = {rule_index: ', '.join(users) for rule_index, users in approvers_by_rule.items()}
+
+    # Output is collected and written once after the loop, messages for
+    # uncovered files are only formatted if there are any
+    covered_lines = []
+    uncovered = {}  # file_path -> winning rule index or None, deduplicated in order
 
     for file_path in changed_files:
-        found_owners = None
-        for rule in reversed_rules:
-            for pattern in rule['patterns']:
-                if file_path.match(pattern):
-                    found_owners = rule['owners']
-                    break 
-            if found_owners:
-                break
-        
-        if not found_owners:
-            logging.warning(f"File {file_path} has no owner in CODEOWNERS-DWH. Failing.")
+        key = resolution_key(file_path) if resolution_key else None
+        if key is not None and key in resolved_rules:
+            rule_index = resolved_rules[key]
+        else:
+            rule_index = match_rule(matcher, file_path)
+            if key is not None:
+                resolved_rules[key] = rule_index
+
+        approvers = approvers_by_rule.get(rule_index)
+        if approvers:
+            covered_lines.append(f"PR for {file_path} is covered by approval from: {approvers}")
+        else:
+            uncovered.setdefault(file_path, rule_index)
+
+    if covered_lines:
+        logging.info('\n'.join(covered_lines))
+
+    unowned_files = [file_path for file_path, rule_index in uncovered.items() if rule_index is None]
+    if unowned_files:
+        logging.warning('\n'.join(f"File {file_path} has no owner in CODEOWNERS-DWH. Failing." for file_path in unowned_files))
+
+    for file_path, rule_index in uncovered.items():
+        if rule_index is None:
             uncovered_files_list.append(f"- {file_path} (has NO owner assigned in CODEOWNERS-DWH)")
-            continue
-        
-        intersection = approved_users.intersection(found_owners)
-        if not intersection:
-            uncovered_files_list.append(f"- {file_path} (requires: {', '.join(found_owners)})")
         else:
-            logging.info(f"PR for {file_path} is covered by approval from: {', '.join(intersection)}")
-    
+            uncovered_files_list.append(f"- {file_path} (requires: {', '.join(rules[rule_index]['owners'])})")
+
     return uncovered_files_list
 
 
-def main():
+async def main_async():
     try:
         REQUIRED_ENV_VARS = {
             "GITHUB_TOKEN": TOKEN,
@@ -251,10 +564,17 @@ def main():
             if not value:
                 fail(f"{var_name} is not set.")
 
-        owner, repo, pr_number = get_pr_context(GITHUB_REPOSITORY, GITHUB_EVENT_PATH)
-        rules = parse_codeowners(CODEOWNERS_FILE)
-        changed_files = get_changed_files(owner, repo, pr_number)
-        approved_users = get_approved_users(owner, repo, pr_number)
+        owner, repo, pr_number, revision = get_pr_context(GITHUB_REPOSITORY, GITHUB_EVENT_PATH)
+        rules = load_codeowners(CODEOWNERS_FILE)
+        all_owners = set().union(*(rule['owners'] for rule in rules))
+        cached_files = load_cached_files(pr_number, revision)
+        # One HTTP/2 connection is shared by every API call
+        async with httpx.AsyncClient(http2=True, headers=HEADERS, timeout=REQUEST_TIMEOUT) as client:
+            changed_files, approved_users = await fetch_pr_data_graphql(
+                client, owner, repo, pr_number, cached_files, all_owners
+            )
+        if cached_files is None:
+            store_cached_files(pr_number, revision, changed_files)
         uncovered_files = check_file_coverage(changed_files, rules, approved_users)
         
         if uncovered_files:
@@ -272,5 +592,9 @@ def main():
         fail(f"An unexpected error occurred: {e}")
 
 
+def main():
+    asyncio.run(main_async())
+
+
 if __name__ == "__main__":
     main()